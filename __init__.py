@@ -1,9 +1,9 @@
-from .nodes.ApiRequestNode import *
-from .nodes.JsonParserNode import *
-from .nodes.EmptyImageNode import *
-from .nodes.LoadImageFromUrlNode import *
-from .nodes.TextToImageNode import *
-from .nodes.SaveVideoRGBA import *
+from .nodes.ApiRequestNode import APIRequestNode
+from .nodes.JsonParserNode import JsonParserNode
+from .nodes.EmptyImageNode import EmptyImageNode
+from .nodes.LoadImageFromUrlNode import LoadImageFromUrlNode
+from .nodes.TextToImageNode import TextToImageNode
+from .nodes.SaveVideoRGBA import SaveVideoRGBA
 
 NODE_CONFIG = {
     # Network nodes
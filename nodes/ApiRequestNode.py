@@ -1,11 +1,33 @@
 import json
-import requests
-from typing import Dict, Any, Tuple, Union
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import TYPE_CHECKING, Dict, Any, Tuple, Union
 from .config.NodeCategory import NodeCategory
 
+if TYPE_CHECKING:
+    import requests
+
 # ComfyUI类型定义
 any = "*"
 
+# 共享的HTTP会话，首次请求时才创建，用于复用连接（keep-alive）
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> "requests.Session":
+    """获取共享的HTTP会话"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+
+            session = requests.Session()
+            # 不在请求之间保留Cookie，保持每次请求相互独立
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            _session = session
+    return _session
+
 
 class APIRequestNode:
     """
@@ -114,6 +136,9 @@ class APIRequestNode:
         Returns:
             Tuple[str, Any]: (响应内容, 透传数据)
         """
+        # 延迟导入requests，避免在ComfyUI启动时加载
+        import requests
+
         # 验证URL
         if not self._validate_url(api_url):
             return ("Error: 无效的URL格式", anything)
@@ -126,10 +151,12 @@ class APIRequestNode:
         if data_format == "json" and "Content-Type" not in header_dict:
             header_dict["Content-Type"] = "application/json"
 
+        session = _get_session()
+
         try:
             # 根据请求方法执行请求
             if request_method == "GET":
-                response = requests.get(
+                response = session.get(
                     api_url, 
                     params=params, 
                     headers=header_dict, 
@@ -137,14 +164,14 @@ class APIRequestNode:
                 )
             elif request_method == "POST":
                 if data_format == "json":
-                    response = requests.post(
+                    response = session.post(
                         api_url, 
                         json=params, 
                         headers=header_dict, 
                         timeout=timeout
                     )
                 else:  # form data
-                    response = requests.post(
+                    response = session.post(
                         api_url, 
                         data=params, 
                         headers=header_dict, 
@@ -152,21 +179,21 @@ class APIRequestNode:
                     )
             elif request_method == "PUT":
                 if data_format == "json":
-                    response = requests.put(
+                    response = session.put(
                         api_url, 
                         json=params, 
                         headers=header_dict, 
                         timeout=timeout
                     )
                 else:
-                    response = requests.put(
+                    response = session.put(
                         api_url, 
                         data=params, 
                         headers=header_dict, 
                         timeout=timeout
                     )
             elif request_method == "DELETE":
-                response = requests.delete(
+                response = session.delete(
                     api_url, 
                     headers=header_dict, 
                     timeout=timeout
@@ -194,12 +221,3 @@ class APIRequestNode:
             return (f"Error: 请求异常 - {str(e)}", anything)
         except Exception as e:
             return (f"Error: 未知错误 - {str(e)}", anything)
-
-
-NODE_CLASS_MAPPINGS = {
-    "API Request Node": APIRequestNode
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "API Request Node": "API请求节点"
-}
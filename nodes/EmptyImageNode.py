@@ -56,12 +56,3 @@ class EmptyImageNode:
         # 返回None作为IMAGE类型
         # 这在条件工作流中很有用，可以作为空分支的占位符
         return (None,)
-
-
-NODE_CLASS_MAPPINGS = {
-    "Empty Image Node": EmptyImageNode
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "Empty Image Node": "空图像节点"
-}
\ No newline at end of file
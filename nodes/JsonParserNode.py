@@ -1,8 +1,84 @@
+import functools
 import json
 import re
 from typing import Dict, Any, Tuple, Union, List
 from .config.NodeCategory import NodeCategory
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON路径分词：点号分隔的键名，或方括号中的索引/键名
+_PATH_TOKEN_RE = re.compile(r'([^.\[\]]+)|\[([^\]]+)\]')
+
+# string输出格式下标量类型的格式化函数
+_SCALAR_FORMATTERS = {
+    str: lambda data: data,
+    int: str,
+    float: str,
+    bool: str,
+}
+
+# 编译后路径步骤的类型
+_STEP_KEY = "key"
+_STEP_INDEX = "index"
+
+# 字典查找未命中的哨兵值
+_MISSING = object()
+
+# 19位及以上的数字串可能超出orjson支持的64位整数范围，此时交给标准库解析，
+# 避免大整数被静默转换为浮点数
+_LONG_DIGITS_RE = re.compile(r"\d{19,}")
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_path(path: str) -> Tuple[Tuple[str, Union[str, int]], ...]:
+    """
+    将JSON路径字符串编译为步骤元组，结果按路径缓存
+    
+    Args:
+        path (str): JSON路径字符串，如 data.items[0].name
+        
+    Returns:
+        Tuple[Tuple[str, Union[str, int]], ...]: (步骤类型, 键名或索引) 序列
+    """
+    steps = []
+    for key, bracket in _PATH_TOKEN_RE.findall(path):
+        if bracket:
+            # 处理数组索引
+            try:
+                steps.append((_STEP_INDEX, int(bracket)))
+            except ValueError:
+                # 如果不是数字，当作字符串键处理
+                steps.append((_STEP_KEY, bracket.strip('"\'')))
+        else:
+            steps.append((_STEP_KEY, key))
+    return tuple(steps)
+
+
+def _loads(text: str) -> Any:
+    """解析JSON字符串，在结果与标准库一致时优先使用orjson"""
+    if orjson is not None and _LONG_DIGITS_RE.search(text) is None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson不接受NaN/Infinity等非标准写法，回退到标准库以保持兼容
+            pass
+    return json.loads(text)
+
+
+def _dumps(data: Any, pretty: bool = False) -> str:
+    """
+    序列化为JSON字符串（非ASCII字符原样输出）
+    
+    始终使用标准库：orjson的浮点数写法（如1e16）、紧凑分隔符和NaN处理
+    都与json.dumps不同，会改变节点的输出
+    """
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    return json.dumps(data, ensure_ascii=False)
+
 
 class JsonParserNode:
     """
@@ -70,59 +146,34 @@ class JsonParserNode:
         if not path.strip():
             return data, "根路径"
         
-        # 分割路径，支持点号和方括号语法
-        path_parts = []
-        current_part = ""
-        in_brackets = False
-        
-        for char in path:
-            if char == '[':
-                if current_part:
-                    path_parts.append(current_part)
-                    current_part = ""
-                in_brackets = True
-            elif char == ']':
-                if in_brackets and current_part:
-                    # 处理数组索引
-                    try:
-                        index = int(current_part)
-                        path_parts.append(index)
-                    except ValueError:
-                        # 如果不是数字，当作字符串键处理
-                        path_parts.append(current_part.strip('"\''))
-                    current_part = ""
-                in_brackets = False
-            elif char == '.' and not in_brackets:
-                if current_part:
-                    path_parts.append(current_part)
-                    current_part = ""
-            else:
-                current_part += char
-        
-        if current_part:
-            path_parts.append(current_part)
+        # 编译路径（结果已缓存），得到 (类型, 键/索引) 步骤序列
+        steps = _compile_path(path)
         
         # 遍历路径提取值
         current_data = data
-        traversed_path = []
         
-        for part in path_parts:
-            traversed_path.append(str(part))
-            
+        for position, (kind, part) in enumerate(steps):
             if isinstance(current_data, dict):
-                if part in current_data:
-                    current_data = current_data[part]
-                else:
-                    return None, f"键 '{part}' 在路径 '{'.'.join(traversed_path)}' 中不存在"
+                # 单次哈希查找
+                value = current_data.get(part, _MISSING)
+                if value is _MISSING:
+                    # 仅在失败时才拼接已遍历的路径
+                    traversed_path = '.'.join(str(step[1]) for step in steps[:position + 1])
+                    return None, f"键 '{part}' 在路径 '{traversed_path}' 中不存在"
+                current_data = value
             elif isinstance(current_data, list):
-                try:
-                    index = int(part) if isinstance(part, str) else part
-                    if 0 <= index < len(current_data):
-                        current_data = current_data[index]
-                    else:
-                        return None, f"索引 {index} 超出数组范围 (长度: {len(current_data)})"
-                except (ValueError, TypeError):
-                    return None, f"无效的数组索引: {part}"
+                if kind == _STEP_INDEX:
+                    index = part
+                else:
+                    # 点号语法的数字键，如 items.0
+                    try:
+                        index = int(part)
+                    except ValueError:
+                        return None, f"无效的数组索引: {part}"
+                if 0 <= index < len(current_data):
+                    current_data = current_data[index]
+                else:
+                    return None, f"索引 {index} 超出数组范围 (长度: {len(current_data)})"
             else:
                 return None, f"无法在类型 {type(current_data).__name__} 上使用路径 '{part}'"
         
@@ -143,12 +194,16 @@ class JsonParserNode:
             return ""
         
         if output_format == "json":
-            return json.dumps(data, ensure_ascii=False)
+            return _dumps(data)
         elif output_format == "pretty_json":
-            return json.dumps(data, ensure_ascii=False, indent=2)
+            return _dumps(data, pretty=True)
         else:  # string
+            # 标量直接转换，只有dict/list才需要序列化
+            formatter = _SCALAR_FORMATTERS.get(type(data))
+            if formatter is not None:
+                return formatter(data)
             if isinstance(data, (dict, list)):
-                return json.dumps(data, ensure_ascii=False)
+                return _dumps(data)
             return str(data)
 
     def parse_input(self, input_type: str, input_string: str, json_path: str, 
@@ -171,7 +226,16 @@ class JsonParserNode:
         
         # 处理JSON输入
         try:
-            parsed_data = json.loads(input_string.strip())
+            try:
+                # 直接解析原始输入，避免strip()复制整个字符串
+                parsed_data = _loads(input_string)
+            except json.JSONDecodeError:
+                # JSON解析器只跳过空格、制表符和换行，全角空格、不间断空格等
+                # Unicode空白需由strip()去除后再重试一次
+                stripped = input_string.strip()
+                if len(stripped) == len(input_string):
+                    raise
+                parsed_data = _loads(stripped)
         except json.JSONDecodeError as e:
             return (f"JSON解析错误: {str(e)}", "JSON格式无效")
         except Exception as e:
@@ -195,13 +259,3 @@ class JsonParserNode:
         # 格式化输出
         formatted_result = self._format_output(result, output_format)
         return (formatted_result, path_info)
-
-
-NODE_CLASS_MAPPINGS = {
-    "JSON Parser Node": JsonParserNode
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "JSON Parser Node": "JSON解析器"
-}
-
@@ -7,12 +7,21 @@ Load Image From URL Node
 import os
 import io
 import base64
+import hashlib
+import mmap
+import re
+import threading
+import time
 import torch
 import numpy as np
 from PIL import Image, ImageOps
-from urllib.parse import urlparse, parse_qs
-import requests
-from typing import Tuple, Optional, List
+from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Tuple, Optional, List
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
 
 try:
     import folder_paths
@@ -22,101 +31,258 @@ except ImportError:
 from .config.NodeCategory import NodeCategory
 
 
+# 并发下载和解码的最大线程数
+MAX_FETCH_WORKERS = 32
+
+# 超过该大小（字节）的本地文件使用内存映射读取
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# 没有图像时返回的空白图像尺寸
+EMPTY_IMAGE_SIZE = 64
+
+# 网络请求超时时间（秒）和失败重试次数
+HTTP_TIMEOUT = 5
+HTTP_RETRIES = 2
+
+# 匹配超过2048字符的URL行（Data URI本身就很长，不做限制）
+_LONG_URL_RE = re.compile(r"(?m)^(?![ \t]*data:)[^\n]{2049,}")
+
+# 共享的HTTP客户端，首次加载网络图像时才创建
+_session = None
+_http2_client = None  # None表示尚未初始化，False表示httpx/h2不可用
+_session_lock = threading.Lock()
+
+
+def _get_session() -> "requests.Session":
+    """获取共享的HTTP会话，复用连接池以避免重复的TCP/TLS握手"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # 延迟导入requests，仅加载本地图像时无需承担导入开销
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=MAX_FETCH_WORKERS,
+                pool_maxsize=MAX_FETCH_WORKERS,
+                max_retries=Retry(total=HTTP_RETRIES, backoff_factor=0.3),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+def _get_http2_client() -> Optional["httpx.Client"]:
+    """获取支持HTTP/2的httpx客户端，未安装httpx或h2时返回None"""
+    global _http2_client
+    with _session_lock:
+        if _http2_client is None:
+            try:
+                import httpx
+
+                # 显式传入transport时Client会忽略自身的limits参数，连接池上限需设置在transport上
+                transport = httpx.HTTPTransport(
+                    http2=True,
+                    retries=HTTP_RETRIES,
+                    limits=httpx.Limits(max_connections=MAX_FETCH_WORKERS),
+                )
+                _http2_client = httpx.Client(transport=transport, follow_redirects=True)
+            except ImportError:
+                _http2_client = False
+    return _http2_client or None
+
+
+def _fetch_url(url: str) -> Image.Image:
+    """下载HTTP/HTTPS图像，并在连接关闭前完成解码"""
+    client = _get_http2_client()
+    if client is not None:
+        # 同一主机的多个请求可在一个HTTP/2连接上复用；
+        # 响应体会被完整读入内存后再解码，不做流式处理
+        response = client.get(url, timeout=HTTP_TIMEOUT)
+        if response.status_code != 200:
+            raise Exception(response.text)
+        i = Image.open(io.BytesIO(response.content))
+        i.load()
+        return i
+
+    with _get_session().get(url, timeout=HTTP_TIMEOUT, stream=True) as response:
+        if response.status_code != 200:
+            raise Exception(response.text)
+        # response.raw不可seek，Image.open会先把完整响应体读入BytesIO再解码，
+        # 因此这里同样是完整缓存后才开始解码，并不能与网络传输重叠
+        response.raw.decode_content = True
+        i = Image.open(response.raw)
+        i.load()
+    return i
+
+
+def _normalize_pil(image: Image.Image, keep_alpha_channel=False) -> Tuple[Image.Image, Optional[Image.Image]]:
+    """
+    一次性完成EXIF旋转和色彩模式转换
+    返回 (RGB/RGBA图像, Alpha通道mask或None)
+    """
+    # 立即解码，使解码工作在调用方线程（如线程池）中完成
+    image.load()
+
+    # 处理EXIF旋转（原地进行，避免额外复制）
+    ImageOps.exif_transpose(image, in_place=True)
+    has_alpha = "A" in image.getbands()
+
+    # 提取Alpha通道作为mask
+    mask = image.getchannel("A") if has_alpha else None
+
+    # 根据设置直接转换到目标模式，只转换一次
+    target_mode = "RGBA" if has_alpha and keep_alpha_channel else "RGB"
+    if image.mode != target_mode:
+        image = image.convert(target_mode)
+
+    return (image, mask)
+
+
+def _open_data_uri(url: str) -> Image.Image:
+    """处理base64编码的图像数据"""
+    return Image.open(io.BytesIO(base64.b64decode(url.split(",")[1])))
+
+
+def _open_path(path: str) -> Image.Image:
+    """打开本地图像文件并立即解码，确保文件句柄在返回前关闭"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            # 大文件使用内存映射，由操作系统按页读取
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                i = Image.open(mm)
+                i.load()
+                # TIFF等格式的EXIF需从文件读取，在关闭前缓存
+                i.getexif()
+        else:
+            i = Image.open(f)
+            i.load()
+            i.getexif()
+    return i
+
+
+def _open_file_uri(url: str) -> Image.Image:
+    """处理file://协议"""
+    path = url[7:]
+    if not os.path.isfile(path):
+        raise Exception(f"File {path} does not exist")
+    return _open_path(path)
+
+
+# ComfyUI内部路径的type参数对应的目录获取函数
+_COMFY_DIRECTORY_GETTERS = {
+    "input": "get_input_directory",
+    "output": "get_output_directory",
+    "temp": "get_temp_directory",
+}
+
+
+def _open_comfy_view(url: str) -> Image.Image:
+    """处理ComfyUI内部路径"""
+    qs_idx = url.find("?")
+    qs = parse_qs(url[qs_idx + 1:])
+    filename = qs.get("name", qs.get("filename", None))
+    if filename is None:
+        raise Exception(f"Invalid url: {url}")
+
+    filename = filename[0]
+    subfolder = qs.get("subfolder", None)
+    if subfolder is not None:
+        filename = os.path.join(subfolder[0], filename)
+
+    dirtype = qs.get("type", ["input"])
+    getter = _COMFY_DIRECTORY_GETTERS.get(dirtype[0])
+    if getter is None:
+        raise Exception(f"Invalid url: {url}")
+
+    return _open_path(os.path.join(getattr(folder_paths, getter)(), filename))
+
+
+def _open_local_path(url: str) -> Image.Image:
+    """处理本地文件路径"""
+    if folder_paths:
+        url = folder_paths.get_annotated_filepath(url)
+    if not os.path.isfile(url):
+        raise Exception(f"Invalid url: {url}")
+    return _open_path(url)
+
+
+# URL前缀到处理函数的分发表，未匹配的按本地文件路径处理
+_URL_HANDLERS = (
+    ("http://", _fetch_url),
+    ("https://", _fetch_url),
+    ("data:image/", _open_data_uri),
+    ("file://", _open_file_uri),
+    ("/view?", _open_comfy_view),
+    ("/api/view?", _open_comfy_view),
+)
+
+
+def _load_single_image(url: str) -> Image.Image:
+    """根据URL前缀分发到对应的处理函数，打开单张图像"""
+    for prefix, handler in _URL_HANDLERS:
+        if url.startswith(prefix):
+            return handler(url)
+    return _open_local_path(url)
+
+
 def load_images_from_url(urls: List[str], keep_alpha_channel=False):
     """
     从URL列表加载图像
     支持多种URL格式：HTTP/HTTPS、file://、data:image/、ComfyUI内部路径等
+    多个图像会在线程池中并发下载和解码（PIL解码时会释放GIL）
     """
     images: List[Image.Image] = []
     masks: List[Optional[Image.Image]] = []
 
-    for url in urls:
-        if url.startswith("data:image/"):
-            # 处理base64编码的图像数据
-            i = Image.open(io.BytesIO(base64.b64decode(url.split(",")[1])))
-        elif url.startswith("file://"):
-            # 处理file://协议
-            url = url[7:]
-            if not os.path.isfile(url):
-                raise Exception(f"File {url} does not exist")
-            i = Image.open(url)
-        elif url.startswith("http://") or url.startswith("https://"):
-            # 处理HTTP/HTTPS URL
-            response = requests.get(url, timeout=5)
-            if response.status_code != 200:
-                raise Exception(response.text)
-            i = Image.open(io.BytesIO(response.content))
-        elif url.startswith(("/view?", "/api/view?")):
-            # 处理ComfyUI内部路径
-            qs_idx = url.find("?")
-            qs = parse_qs(url[qs_idx + 1:])
-            filename = qs.get("name", qs.get("filename", None))
-            if filename is None:
-                raise Exception(f"Invalid url: {url}")
-
-            filename = filename[0]
-            subfolder = qs.get("subfolder", None)
-            if subfolder is not None:
-                filename = os.path.join(subfolder[0], filename)
-
-            dirtype = qs.get("type", ["input"])
-            if dirtype[0] == "input":
-                url = os.path.join(folder_paths.get_input_directory(), filename)
-            elif dirtype[0] == "output":
-                url = os.path.join(folder_paths.get_output_directory(), filename)
-            elif dirtype[0] == "temp":
-                url = os.path.join(folder_paths.get_temp_directory(), filename)
-            else:
-                raise Exception(f"Invalid url: {url}")
+    # 去重：相同URL只下载和解码一次，并跳过空URL
+    unique_urls = [url for url in dict.fromkeys(urls) if url != ""]
 
-            i = Image.open(url)
-        elif url == "":
-            # 跳过空URL
-            continue
-        else:
-            # 处理本地文件路径
-            if folder_paths:
-                url = folder_paths.get_annotated_filepath(url)
-            if not os.path.isfile(url):
-                raise Exception(f"Invalid url: {url}")
-            i = Image.open(url)
-
-        # 处理EXIF旋转
-        i = ImageOps.exif_transpose(i)
-        has_alpha = "A" in i.getbands()
-        mask = None
-
-        # 确保图像格式正确
-        if "RGB" not in i.mode:
-            i = i.convert("RGBA") if has_alpha else i.convert("RGB")
-
-        # 提取Alpha通道作为mask
-        if has_alpha:
-            mask = i.getchannel("A")
-
-        # 根据设置决定是否保留Alpha通道
-        if not keep_alpha_channel:
-            image = i.convert("RGB")
-        else:
-            image = i
+    def load(url: str) -> Tuple[Image.Image, Optional[Image.Image]]:
+        return _normalize_pil(_load_single_image(url), keep_alpha_channel)
 
-        images.append(image)
-        masks.append(mask)
+    if len(unique_urls) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(unique_urls))) as executor:
+            results = list(executor.map(load, unique_urls))
+    else:
+        results = [load(url) for url in unique_urls]
+    loaded = dict(zip(unique_urls, results))
+
+    # 按原始顺序展开，重复的URL共享同一个已解码图像
+    for url in urls:
+        if url in loaded:
+            image, mask = loaded[url]
+            images.append(image)
+            masks.append(mask)
 
     return (images, masks)
 
 
 def pil2tensor(image: Image.Image) -> torch.Tensor:
     """将PIL图像转换为PyTorch张量"""
-    return torch.from_numpy(np.array(image).astype(np.float32) / 255.0).unsqueeze(0)
+    # 以uint8拷贝像素后在torch中原地归一化，避免numpy中间float32缓冲区
+    return torch.from_numpy(np.array(image)).unsqueeze(0).float().div_(255.0)
+
 
+def pil2mask(mask: Image.Image) -> torch.Tensor:
+    """将Alpha通道图像转换为ComfyUI遮罩张量（透明区域为1）"""
+    return torch.from_numpy(np.array(mask)).float().div_(-255.0).add_(1.0)
 
-def tensor2pil(image: torch.Tensor, mode="RGB") -> Image.Image:
-    """将PyTorch张量转换为PIL图像"""
-    return Image.fromarray(np.clip(255. * image.cpu().numpy().squeeze(), 0, 255).astype(np.uint8), mode)
+
+def empty_image_tensors(size: int = EMPTY_IMAGE_SIZE) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    生成空白占位图像（黑色）和遮罩（全透明）
+    每次调用都新建张量，避免下游节点的原地修改影响后续运行
+    """
+    image = torch.zeros((1, size, size, 3), dtype=torch.float32, device="cpu")
+    mask = torch.ones((1, size, size), dtype=torch.float32, device="cpu")
+    return (image, mask)
 
 
-def prepare_image_for_preview(image: Image.Image, output_dir: str, filename_prefix: str) -> dict:
+def prepare_image_for_preview(image: Optional[Image.Image], output_dir: str, filename_prefix: str) -> dict:
     """为图像准备预览信息"""
     # 这里简化实现，实际应该保存临时文件并返回预览信息
     return {
@@ -161,6 +327,10 @@ class LoadImageFromUrlNode:
                     "BOOLEAN",
                     {"default": False, "label_on": "list", "label_off": "batch"},
                 ),
+                "force_refresh": (
+                    "BOOLEAN",
+                    {"default": False, "label_on": "enabled", "label_off": "disabled"},
+                ),
             },
         }
     
@@ -184,6 +354,7 @@ class LoadImageFromUrlNode:
 • 自动处理图像格式转换和EXIF旋转
 • 可选保留Alpha通道（透明度）
 • 灵活的输出模式：批次模式或列表模式
+• URL不变时复用缓存结果，可开启force_refresh强制重新加载
 • 自定义网络请求超时时间
 • 智能错误处理：加载失败时返回空白图像
 • 兼容ComfyUI的图像张量格式
@@ -200,7 +371,7 @@ class LoadImageFromUrlNode:
 • 处理包含透明度的图像
 """
     
-    def load_image(self, image: str, keep_alpha_channel=False, output_mode=False):
+    def load_image(self, image: str, keep_alpha_channel=False, output_mode=False, force_refresh=False):
         """
         加载图像的主要方法
         
@@ -208,6 +379,7 @@ class LoadImageFromUrlNode:
             image: URL字符串，每行一个URL
             keep_alpha_channel: 是否保留Alpha通道
             output_mode: 输出模式，False为批次模式，True为列表模式
+            force_refresh: 是否忽略缓存强制重新加载（由IS_CHANGED处理）
             
         Returns:
             包含UI预览和结果的字典
@@ -217,89 +389,98 @@ class LoadImageFromUrlNode:
         has_image = len(pil_images) > 0
         
         if not has_image:
-            # 没有图像时返回空白图像
-            i = torch.zeros((1, 64, 64, 3), dtype=torch.float32, device="cpu")
-            m = torch.zeros((64, 64), dtype=torch.float32, device="cpu")
-            pil_images = [tensor2pil(i)]
-            pil_masks = [tensor2pil(m, mode="L")]
-
-        previews = []
-        np_images: list[torch.Tensor] = []
-        np_masks: list[torch.Tensor] = []
-
-        for pil_image, pil_mask in zip(pil_images, pil_masks):
-            if pil_mask is not None:
-                preview_image = Image.new("RGB", pil_image.size)
-                preview_image.paste(pil_image, (0, 0))
-                preview_image.putalpha(pil_mask)
-            else:
-                preview_image = pil_image
-
-            previews.append(prepare_image_for_preview(preview_image, self.output_dir, self.filename_prefix))
-
-            np_image = pil2tensor(pil_image)
-            if pil_mask:
-                np_mask = np.array(pil_mask).astype(np.float32) / 255.0
-                np_mask = 1.0 - torch.from_numpy(np_mask)
-            else:
-                np_mask = torch.zeros((64, 64), dtype=torch.float32, device="cpu")
+            # 没有图像时直接返回空白图像张量，无需经过PIL
+            empty_image, empty_mask = empty_image_tensors()
+            previews = [prepare_image_for_preview(None, self.output_dir, self.filename_prefix)]
+            return {"ui": {"images": previews}, "result": ([empty_image], [empty_mask], has_image)}
 
-            np_images.append(np_image)
-            np_masks.append(np_mask.unsqueeze(0))
+        # 预览信息只依赖文件名，不读取像素，因此无需再合成带Alpha的预览图
+        previews = [
+            prepare_image_for_preview(pil_image, self.output_dir, self.filename_prefix)
+            for pil_image in pil_images
+        ]
 
         if output_mode:
+            np_images: list[torch.Tensor] = []
+            np_masks: list[torch.Tensor] = []
+            # 重复URL对应同一个PIL对象，只转换一次；之后的重复项使用克隆，
+            # 避免下游节点原地修改某一项时影响列表中的其他项
+            converted = {}
+            for pil_image, pil_mask in zip(pil_images, pil_masks):
+                key = id(pil_image)
+                if key not in converted:
+                    if pil_mask is not None:
+                        np_mask = pil2mask(pil_mask)
+                    else:
+                        np_mask = torch.zeros((EMPTY_IMAGE_SIZE, EMPTY_IMAGE_SIZE), dtype=torch.float32, device="cpu")
+                    np_image = pil2tensor(pil_image)
+                    np_mask = np_mask.unsqueeze(0)
+                    converted[key] = (np_image, np_mask)
+                else:
+                    np_image, np_mask = converted[key]
+                    np_image, np_mask = np_image.clone(), np_mask.clone()
+
+                np_images.append(np_image)
+                np_masks.append(np_mask)
+
             result = (np_images, np_masks, has_image)
         else:
-            has_size_mismatch = False
-            if len(np_images) > 1:
-                for np_image in np_images[1:]:
-                    if np_image.shape[1] != np_images[0].shape[1] or np_image.shape[2] != np_images[0].shape[2]:
-                        has_size_mismatch = True
-                        break
-
-            if has_size_mismatch:
-                raise Exception("To output as batch, images must have the same size. Use list output mode instead.")
+            width, height = pil_images[0].size
+            for pil_image in pil_images[1:]:
+                if pil_image.size != (width, height):
+                    raise Exception("To output as batch, images must have the same size. Use list output mode instead.")
+
+            # 先将整个批次写入一块uint8暂存张量，再一次性转换为float32，
+            # 避免单张张量分配、逐张浮点转换和torch.cat的二次复制
+            batch_size = len(pil_images)
+            channels = len(pil_images[0].getbands())
+            staging = torch.empty((batch_size, height, width, channels), dtype=torch.uint8, device="cpu")
+            staging_np = staging.numpy()
+            for idx, pil_image in enumerate(pil_images):
+                staging_np[idx] = np.asarray(pil_image)
+            out_images = staging.float().div_(255.0)
+
+            if any(pil_mask is not None for pil_mask in pil_masks):
+                # 无遮罩的图像填充255，反转后即为全0遮罩
+                mask_staging = torch.full((batch_size, height, width), 255, dtype=torch.uint8, device="cpu")
+                mask_staging_np = mask_staging.numpy()
+                for idx, pil_mask in enumerate(pil_masks):
+                    if pil_mask is not None:
+                        mask_staging_np[idx] = np.asarray(pil_mask)
+                out_masks = mask_staging.float().div_(-255.0).add_(1.0)
+            else:
+                out_masks = torch.zeros((batch_size, EMPTY_IMAGE_SIZE, EMPTY_IMAGE_SIZE), dtype=torch.float32, device="cpu")
 
-            result = ([torch.cat(np_images)], [torch.cat(np_masks)], has_image)
+            result = ([out_images], [out_masks], has_image)
 
         return {"ui": {"images": previews}, "result": result}
     
     @classmethod
     def VALIDATE_INPUTS(cls, **kwargs):
         """验证输入参数"""
-        urls = kwargs.get("urls", "")
+        urls = kwargs.get("image", "")
         timeout = kwargs.get("timeout", 30)
         
         # 验证超时参数
         if not isinstance(timeout, int) or timeout < 5 or timeout > 120:
             return "超时时间必须在5-120秒之间"
         
-        # 验证URL格式（基本检查）
+        # 验证URL格式（基本检查），一次正则扫描找出过长的行
         if urls and isinstance(urls, str):
-            url_list = [url.strip() for url in urls.strip().split("\n") if url.strip()]
-            for url in url_list:
-                if len(url) > 2048:  # URL长度限制
-                    return f"URL过长（超过2048字符）: {url[:50]}..."
+            match = _LONG_URL_RE.search(urls)
+            if match:
+                return f"URL过长（超过2048字符）: {match.group().strip()[:50]}..."
         
         return True
     
     @classmethod
     def IS_CHANGED(cls, **kwargs):
         """检查输入是否发生变化"""
-        # 对于URL输入，我们总是重新加载以确保获取最新内容
-        urls = kwargs.get("urls", "")
-        if urls and urls.strip():
-            # 为网络URL添加时间戳以确保重新加载
-            import time
+        # 强制刷新时每次返回不同的值，确保重新加载最新内容
+        if kwargs.get("force_refresh", False):
             return str(time.time())
-        return kwargs.get("urls", "")
-
-
-# 节点映射
-NODE_CLASS_MAPPINGS = {
-    "LoadImageFromUrlNode": LoadImageFromUrlNode
-}
 
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "LoadImageFromUrlNode": "Load Images From URL"
-}
\ No newline at end of file
+        # 否则只在URL或Alpha设置变化时重新执行，充分利用ComfyUI的缓存
+        urls = kwargs.get("image", "")
+        keep_alpha_channel = kwargs.get("keep_alpha_channel", False)
+        return hashlib.sha1(f"{urls}\n{keep_alpha_channel}".encode("utf-8")).hexdigest()
@@ -2,9 +2,10 @@ from __future__ import annotations
 from typing_extensions import override
 from typing import Optional, Tuple, Dict, Any
 from fractions import Fraction
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from PIL import Image
 import torch
+import torch.nn.functional as F
 import numpy as np
 import io
 import json
@@ -163,18 +164,25 @@ class SaveVideoRGBA(io.ComfyNode):
             )
 
             width, height = video.get_dimensions()
-            results = []
 
             # 处理预览和保存
+            tasks = []
             if only_preview or has_alpha:
-                preview_result = cls._save_preview(video, width, height, has_alpha)
-                if preview_result:
-                    results.append(preview_result)
+                tasks.append(lambda: cls._save_preview(video, width, height, has_alpha))
 
             if not only_preview:
-                save_result = cls._save_final(video, filename_prefix, width, height, has_alpha, format)
-                if save_result:
-                    results.append(save_result)
+                tasks.append(lambda: cls._save_final(video, filename_prefix, width, height, has_alpha, format))
+
+            # 预览和最终视频相互独立，同时需要时并行编码（编码器运行时会释放GIL）
+            if len(tasks) > 1:
+                # 两次编码共用同一份uint8帧，在启动线程前转换好
+                video.cache_frames()
+                with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                    saved = list(executor.map(lambda task: task(), tasks))
+            else:
+                saved = [task() for task in tasks]
+
+            results = [result for result in saved if result]
 
             return io.NodeOutput(ui=ui.PreviewVideo(results))
             
@@ -195,17 +203,30 @@ class SaveVideoRGBA(io.ComfyNode):
         
         print(f'调整视频尺寸从 {W}x{H} 到 {new_width}x{new_height}')
 
-        # 批量处理图像调整大小，提高性能
-        images_np = (images.cpu().numpy() * 255).astype(np.uint8)
-        resized_images = []
-        
-        for i in range(B):
-            img = Image.fromarray(images_np[i])
-            resized_img = img.resize((new_width, new_height), Image.LANCZOS)
-            resized_tensor = torch.from_numpy(np.array(resized_img).astype(np.float32) / 255.0)
-            resized_images.append(resized_tensor)
+        # 在张量所在设备上一次性批量缩放（BHWC -> BCHW），避免逐帧转换为PIL
+        frames = images.movedim(-1, 1)
+        if C == 4:
+            # 与PIL一致，在预乘Alpha空间中插值，避免全透明像素的颜色渗入边缘
+            alpha = frames[:, 3:4]
+            frames = torch.cat((frames[:, :3] * alpha, alpha), dim=1)
+
+        resized = F.interpolate(
+            frames,
+            size=(new_height, new_width),
+            mode="bicubic",
+            align_corners=False,
+            antialias=True,
+        )
+        # 双三次插值可能产生过冲，限制回 [0, 1]
+        resized.clamp_(0.0, 1.0)
+
+        if C == 4:
+            # 还原为非预乘颜色，Alpha为0的像素颜色置0
+            alpha = resized[:, 3:4]
+            rgb = resized[:, :3]
+            rgb.div_(alpha.clamp(min=1e-6)).clamp_(0.0, 1.0).mul_(alpha > 0)
 
-        return torch.stack(resized_images, dim=0)
+        return resized.movedim(1, -1).contiguous()
 
     @staticmethod
     def _save_preview(video: 'RGBAVideoFromComponents', width: int, height: int, has_alpha: bool) -> Optional[ui.SavedResult]:
@@ -277,6 +298,7 @@ class RGBAVideoFromComponents(VideoInput):
 
     def __init__(self, components: VideoComponents):
         self.__components = components
+        self.__frames: Optional[np.ndarray] = None
 
     def get_components(self) -> VideoComponents:
         """获取视频组件"""
@@ -286,6 +308,27 @@ class RGBAVideoFromComponents(VideoInput):
             frame_rate=self.__components.frame_rate
         )
 
+    def cache_frames(self) -> None:
+        """
+        将全部视频帧一次性转换为uint8并缓存，供多次编码共用
+        缓存会占用整段视频的uint8内存，仅在同一视频需要编码多次时调用
+        """
+        if self.__frames is None:
+            images = self.__components.images
+            frames = torch.empty(images.shape, dtype=torch.uint8, device="cpu")
+            # 逐帧写入，避免为整段视频分配额外的float临时张量
+            for i in range(images.shape[0]):
+                frames[i].copy_((images[i] * 255).clamp_(0, 255))
+            self.__frames = frames.numpy()
+
+    def _iter_frames(self):
+        """逐帧产出uint8视频帧，已缓存时直接复用缓存"""
+        if self.__frames is not None:
+            yield from self.__frames
+            return
+        for frame_tensor in self.__components.images:
+            yield (frame_tensor * 255).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+
     def get_dimensions(self) -> Tuple[int, int]:
         """获取视频尺寸"""
         return self.__components.images.shape[2], self.__components.images.shape[1]
@@ -384,9 +427,7 @@ class RGBAVideoFromComponents(VideoInput):
 
     def _encode_video_frames(self, video_stream: av.VideoStream, output: av.OutputContainer, has_alpha: bool) -> None:
         """编码视频帧"""
-        for frame_tensor in self.__components.images:
-            img = (frame_tensor * 255).clamp(0, 255).byte().cpu().numpy()
-
+        for img in self._iter_frames():
             # 创建视频帧
             if has_alpha:
                 frame = av.VideoFrame.from_ndarray(img, format='rgba')
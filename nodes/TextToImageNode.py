@@ -8,64 +8,87 @@ import torch
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import os
+import re
+import functools
 import tempfile
 from .config.NodeCategory import NodeCategory
 
 
 def pil2tensor(image):
     """将PIL图像转换为tensor"""
-    return torch.from_numpy(np.array(image).astype(np.float32) / 255.0).unsqueeze(0)
+    # 以uint8拷贝像素后在torch中原地归一化，避免numpy中间float32缓冲区
+    return torch.from_numpy(np.array(image)).float().div_(255.0).unsqueeze_(0)
+
+
+# 字体目录及支持的字体文件扩展名
+FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fonts")
+FONT_EXTENSIONS = ('.ttf', '.ttc', '.otf', '.woff', '.woff2')
+DEFAULT_FONT_NAME = "默认字体"
+
+# 完整的3位或6位十六进制颜色（不含#）
+_HEX_COLOR_RE = re.compile(r"[0-9a-fA-F]{3}|[0-9a-fA-F]{6}")
+
+# 字体扫描缓存：(目录修改时间, 字体名称列表, {字体名称: 文件路径})
+_font_cache = None
+
+
+def _scan_fonts():
+    """扫描fonts文件夹，结果缓存到目录修改时间变化为止"""
+    global _font_cache
+    try:
+        mtime = os.path.getmtime(FONT_DIR)
+    except OSError:
+        mtime = None
+
+    if _font_cache is None or _font_cache[0] != mtime:
+        available_fonts = [DEFAULT_FONT_NAME]  # 默认选项
+        font_paths = {}
+        if mtime is not None:
+            for filename in os.listdir(FONT_DIR):
+                if filename.lower().endswith(FONT_EXTENSIONS):
+                    # 移除扩展名作为显示名称
+                    font_name = os.path.splitext(filename)[0]
+                    available_fonts.append(font_name)
+                    font_paths.setdefault(font_name, os.path.join(FONT_DIR, filename))
+        _font_cache = (mtime, available_fonts, font_paths)
+
+    return _font_cache
 
 
 def get_available_fonts():
     """获取fonts文件夹中的可用字体列表"""
-    # 获取当前文件的目录
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    # 构建fonts文件夹的相对路径
-    font_dir = os.path.join(os.path.dirname(current_dir), "fonts")
-    
-    available_fonts = ["默认字体"]  # 默认选项
-    
-    if os.path.exists(font_dir):
-        # 支持的字体文件扩展名
-        font_extensions = ['.ttf', '.ttc', '.otf', '.woff', '.woff2']
-        
-        for filename in os.listdir(font_dir):
-            if any(filename.lower().endswith(ext) for ext in font_extensions):
-                # 移除扩展名作为显示名称
-                font_name = os.path.splitext(filename)[0]
-                available_fonts.append(font_name)
-    
-    return available_fonts
+    return list(_scan_fonts()[1])
 
 
 def get_font_path(font_name):
-    """根据字体名称获取字体文件路径"""
-    if font_name == "默认字体":
+    """根据字体名称获取字体文件路径，未找到时返回None使用默认字体"""
+    if font_name == DEFAULT_FONT_NAME:
         return None
-    
-    # 获取当前文件的目录
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    # 构建font文件夹的相对路径
-    font_dir = os.path.join(os.path.dirname(current_dir), "fonts")
-    
-    if os.path.exists(font_dir):
-        # 支持的字体文件扩展名
-        font_extensions = ['.ttf', '.ttc', '.otf', '.woff', '.woff2']
-        
-        for filename in os.listdir(font_dir):
-            if any(filename.lower().endswith(ext) for ext in font_extensions):
-                # 检查文件名（不含扩展名）是否匹配
-                if os.path.splitext(filename)[0] == font_name:
-                    return os.path.join(font_dir, filename)
-    
-    # 如果没有找到指定字体，返回None使用默认字体
-    return None
+    return _scan_fonts()[2].get(font_name)
+
 
+@functools.lru_cache(maxsize=32)
+def load_font(font_path, font_size):
+    """加载字体对象，按 (字体路径, 字号) 缓存，避免每次调用都重新解析字体文件"""
+    if font_path:
+        return ImageFont.truetype(font_path, font_size)
+    return ImageFont.load_default()
 
+
+@functools.lru_cache(maxsize=256)
 def hex_to_rgb(hex_color):
-    """将十六进制颜色转换为RGB元组"""
+    """将十六进制颜色转换为RGB元组（结果按颜色字符串缓存）"""
     hex_color = hex_color.lstrip('#')
+    # int(..., 16)会接受下划线、0x前缀和正负号，先确认是纯十六进制再走快速路径
+    if _HEX_COLOR_RE.fullmatch(hex_color):
+        value = int(hex_color, 16)
+        if len(hex_color) == 6:
+            # 整体解析一次，再用位运算拆分通道
+            return ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+        # 简写形式每个通道4位，乘以17即扩展为8位（如 f -> ff）
+        return (((value >> 8) & 0xF) * 17, ((value >> 4) & 0xF) * 17, (value & 0xF) * 17)
+
+    # 其他输入保持原有的逐通道解析行为（非法字符会抛出异常）
     if len(hex_color) == 6:
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
     elif len(hex_color) == 3:
@@ -93,6 +116,7 @@ class TextToImageNode:
     
     @classmethod
     def INPUT_TYPES(cls):
+        available_fonts = get_available_fonts()
         return {
             "required": {
                 "text": ("STRING", {
@@ -100,8 +124,8 @@ class TextToImageNode:
                     "default": "Hello World\n你好世界",
                     "placeholder": "输入要转换为图片的文本..."
                 }),
-                "font_name": (get_available_fonts(), {
-                    "default": get_available_fonts()[0] if get_available_fonts() else "默认字体"
+                "font_name": (available_fonts, {
+                    "default": available_fonts[0]
                 }),
                 "font_size": ("INT", {
                     "default": 48,
@@ -180,12 +204,6 @@ class TextToImageNode:
         Returns:
             list: 换行后的文本行列表
         """
-        import re
-        
-        # 创建临时图像来测量文本
-        temp_img = Image.new('RGB', (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
-        
         # 首先按原有换行符分割
         original_lines = text.split('\n')
         wrapped_lines = []
@@ -197,7 +215,7 @@ class TextToImageNode:
                 continue
                 
             # 检查当前行是否需要换行
-            bbox = temp_draw.textbbox((0, 0), line, font=font)
+            bbox = font.getbbox(line)
             line_width = bbox[2] - bbox[0]
             
             if line_width <= max_width:
@@ -213,7 +231,7 @@ class TextToImageNode:
                 for token in tokens:
                     # 测试添加当前token后的宽度
                     test_line = current_line + token
-                    bbox = temp_draw.textbbox((0, 0), test_line, font=font)
+                    bbox = font.getbbox(test_line)
                     test_width = bbox[2] - bbox[0]
                     
                     if test_width <= max_width:
@@ -230,7 +248,7 @@ class TextToImageNode:
                                 char_line = ""
                                 for char in token:
                                     test_char_line = char_line + char
-                                    bbox = temp_draw.textbbox((0, 0), test_char_line, font=font)
+                                    bbox = font.getbbox(test_char_line)
                                     test_char_width = bbox[2] - bbox[0]
                                     
                                     if test_char_width <= max_width:
@@ -267,9 +285,9 @@ class TextToImageNode:
             font_path = get_font_path(font_name)
             try:
                 if font_path and os.path.exists(font_path):
-                    font = ImageFont.truetype(font_path, font_size)
+                    font = load_font(font_path, font_size)
                 else:
-                    font = ImageFont.load_default()
+                    font = load_font(None, font_size)
             except Exception as e:
                 print(f"字体加载失败: {e}, 使用默认字体")
                 font = ImageFont.load_default()
@@ -280,39 +298,28 @@ class TextToImageNode:
             # 自动换行处理
             lines = self.wrap_text(text, font, max_text_width)
             
-            # 创建临时图像来测量文本尺寸
-            temp_img = Image.new('RGB', (1, 1), bg_rgb)
-            temp_draw = ImageDraw.Draw(temp_img)
-            
-            # 计算每行的尺寸
-            line_heights = []
-            line_widths = []
+            # 测量各行尺寸，只需保留最大宽度和最大行高
             max_width = 0
-            
+            base_line_height = 0
             for line in lines:
                 if line.strip() == "":
                     # 空行处理
                     line_width = 0
                     line_height = font_size
                 else:
-                    # 使用textbbox获取更准确的文本尺寸
-                    bbox = temp_draw.textbbox((0, 0), line, font=font)
+                    # 直接用字体对象测量，无需临时图像和绘图上下文
+                    bbox = font.getbbox(line)
                     line_width = bbox[2] - bbox[0]
                     line_height = bbox[3] - bbox[1]
-                
-                line_widths.append(line_width)
-                line_heights.append(line_height)
                 max_width = max(max_width, line_width)
+                base_line_height = max(base_line_height, line_height)
             
-            # 计算总高度
-            if line_heights:
-                base_line_height = max(line_heights) if line_heights else font_size
-                total_height = base_line_height * len(lines)
-                # 添加行间距
-                if len(lines) > 1:
-                    total_height += base_line_height * (line_spacing - 1) * (len(lines) - 1)
-            else:
-                total_height = font_size
+            if not base_line_height:
+                base_line_height = font_size
+            
+            # 所有行使用统一的行距，绘制与画布高度计算保持一致
+            line_advance = int(base_line_height * line_spacing)
+            total_height = base_line_height + line_advance * max(len(lines) - 1, 0)
             
             # 计算画布尺寸
             canvas_width = min(max_width + (padding * 2), 1024)  # 限制最大宽度为1024
@@ -326,18 +333,17 @@ class TextToImageNode:
             image = Image.new('RGB', (canvas_width, canvas_height), bg_rgb)
             draw = ImageDraw.Draw(image)
             
-            # 绘制文本
-            y_offset = padding
-            for i, line in enumerate(lines):
-                if line.strip() != "":
-                    # 左对齐，保持左边距
-                    x_offset = padding
-                    draw.text((x_offset, y_offset), line, fill=text_rgb, font=font)
-                
-                # 移动到下一行
-                if i < len(lines) - 1:
-                    line_height = line_heights[i] if i < len(line_heights) else font_size
-                    y_offset += int(line_height * line_spacing)
+            # 一次调用完成多行排版和绘制（左对齐，保持左边距）
+            # multiline_text的行距为字母"A"的高度加spacing，据此换算出统一行距
+            spacing = line_advance - font.getbbox("A")[3]
+            draw.multiline_text(
+                (padding, padding),
+                "\n".join(lines),
+                fill=text_rgb,
+                font=font,
+                spacing=spacing,
+                align="left",
+            )
             
             # 转换为tensor
             image_tensor = pil2tensor(image)
@@ -353,13 +359,4 @@ class TextToImageNode:
             return (pil2tensor(error_img),)
 
 
-# 节点映射
-NODE_CLASS_MAPPINGS = {
-    "TextToImageNode": TextToImageNode
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "TextToImageNode": "Text To Image"
-}
-
-__all__ = ['TextToImageNode', 'NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS']
\ No newline at end of file
+__all__ = ['TextToImageNode']